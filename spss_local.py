@@ -12,13 +12,12 @@
 # -------------------------------------------------------------------------------
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-import scipy.stats as stats
-import plotly.express as px
-import plotly.graph_objects as go
-import datetime as dt
-from utils import *
+import os
+from utils import (read_survey, read_trussHeight, read_beamInfo, calc_settlement, calc_forecast_settlement, calc_differental_settlement,
+                   calc_plan_dataframe, calc_3d_dataframe, plot_beamStyles, plot_floorStyles, plot_annotations,
+                   plot_DiffSettlement_plan, plot_SlopeSettlement_plan, plot_floorDiffElev_plan, plot_floorSlopeElev_plan,
+                   plot_lugElev_plan, plot_lugFloorHeight_plan, plot_cumulative_settlement, plot_delta_settlement,
+                   plot_settlementRate, plot_3D_settlement_slider_animated)
 
 #st.set_page_config(layout="wide")
 
@@ -44,35 +43,36 @@ nyears = 5
 
 # if st.sidebar.button('Compute Settlement'):
 
-# Calculate data for plotting 
-survey_clean, survey_long = read_survey(surveyfile)
-truss_clean = read_trussHeight(trussfile)
-beamInfo, beamLength, MPlocations = read_beamInfo()
+# Calculate data for plotting
+survey_clean, survey_long = read_survey(surveyfile, os.path.getmtime(surveyfile))
+truss_clean = read_trussHeight(trussfile, os.path.getmtime(trussfile))
+beamInfo, beamLength, MPlocations, beamLength_long, beamLength_sort, beamGeom, beamStartIdx, beamEndIdx = read_beamInfo()
 settlement, settlement_points, settlement_delta, settlement_delta_MP, settlement_rate = calc_settlement(survey_long)
-settlementProj = calc_forecast_settlement(settlement, nsurvey, nyears)
-beamDiff, beamDiffplot, beamSlope, beamSlopeplot, beamLength_long, beamLength_sort = calc_differental_settlement(beamLength, survey_clean, beamInfo)
-lugElevPlot, lugFloorPlot, floorElevPlot, floorDiff, floorDiffplot, floorSlope, floorSlopeplot = calc_plan_dataframe (survey_clean, truss_clean, MPlocations, beamLength_long, beamLength_sort, beamLength, beamInfo)
-beamDir, beamSymbol, beamDiffColor, beamSlopeColor, floorDir, floorSymbolplot, floorDiffColorplot, floorSlopeColorplot, beamDiffAnno, beamSlopeAnno, diffAnno, slopeAnno, color_dict, maps = plot_annotations(beamInfo, beamDiff, beamSlope, floorDiff, floorDiffplot, floorSlope, floorSlopeplot)
-settlementStart, beamInfo3D = calc_3d_dataframe(beamInfo, settlement_points, beamSlopeColor)
+settlementProj, settlementProj_trans = calc_forecast_settlement(settlement, nsurvey, nyears)
+beamDiff, beamDiffplot, beamSlope, beamSlopeplot, beamSlopeProj = calc_differental_settlement(beamLength, beamLength_sort, MPlocations, beamStartIdx, beamEndIdx, survey_clean, beamInfo, settlementProj_trans)
+lugElevPlot, lugFloorPlot, floorElevPlot, floorDiff, floorDiffplot, floorSlope, floorSlopeplot = calc_plan_dataframe (survey_clean, truss_clean, MPlocations, beamLength, beamLength_sort, beamStartIdx, beamEndIdx, beamInfo)
+beamDirLabels, beamDir, beamSymbol, beamDiffColor, beamSlopeColor, beamSlopeProjColor = plot_beamStyles(beamInfo, beamDiff, beamSlope, beamSlopeProj)
+floorDir, floorSymbolplot, floorDiffColorplot, floorSlopeColorplot = plot_floorStyles(beamDirLabels, beamInfo, floorDiff, floorDiffplot, floorSlope, floorSlopeplot)
+beamDiffAnno, beamSlopeAnno, diffAnno, slopeAnno, plot3dAnno, color_dict, maps = plot_annotations()
+beam3D = calc_3d_dataframe(beamInfo, settlement_points, settlementProj_trans, beamSlopeColor, beamSlopeProjColor)
 
 # Differental Settlement Planview
-fig_diff_plan = plot_DiffSettlement_plan(beamDiffplot, beamInfo, beamDiffColor, beamSymbol, beamDir, beamDiffAnno)
+fig_diff_plan = plot_DiffSettlement_plan(beamDiffplot, beamGeom, beamDiffColor, beamSymbol, beamDir, beamDiffAnno)
 
 # Differental Settlement Slope Planview
-fig_slope_plan = plot_SlopeSettlement_plan(beamSlopeplot, beamInfo, beamSlopeColor, beamSymbol, beamDir, beamSlopeAnno)
+fig_slope_plan = plot_SlopeSettlement_plan(beamSlopeplot, beamGeom, beamSlopeColor, beamSymbol, beamDir, beamSlopeAnno)
 
 # Differental Floor Elevation Planview 
-fig_floorElev_plan = plot_floorDiffElev_plan(floorDiffColorplot, beamInfo, floorDiffplot, floorSymbolplot, floorDir, floorElevPlot, diffAnno)
-fig_floorElev_plan.show()
+fig_floorElev_plan = plot_floorDiffElev_plan(floorDiffColorplot, beamGeom, floorDiffplot, floorSymbolplot, floorDir, floorElevPlot, diffAnno)
 
 # Differental Floor Slope Planview
-fig_floorSlope_plan = plot_floorSlopeElev_plan(floorSlopeColorplot, beamInfo, floorSlopeplot, floorSymbolplot, floorElevPlot, floorDir, slopeAnno)
+fig_floorSlope_plan = plot_floorSlopeElev_plan(floorSlopeColorplot, beamGeom, floorSlopeplot, floorSymbolplot, floorElevPlot, floorDir, slopeAnno)
 
 # Lug Elevation
-fig_lugElev_plan = plot_lugElev_plan(lugElevPlot, beamInfo)
+fig_lugElev_plan = plot_lugElev_plan(lugElevPlot, beamGeom)
 
 # Lug to Floor Height
-fig_lugTrussHeight_plan = plot_lugFloorHeight_plan(lugFloorPlot, beamInfo)
+fig_lugTrussHeight_plan = plot_lugFloorHeight_plan(lugFloorPlot, beamGeom)
 
 # # Create Streamlit Plot objects - Plan Figure
 # tab1, tab2, tab3, tab4 = st.tabs(["Differental Floor Elevation [in]", "Differental Floor Slope [in/ft]", 
@@ -111,6 +111,10 @@ fig_rate = plot_settlementRate(settlement_rate, color_dict, maps)
 # # Differental Settlement 3D
 # left_co, cent_co,last_co = st.columns([0.025, 0.95, 0.025])
 # with cent_co:
-fig_3d_slider = plot_3D_settlement_slider_animated(settlementStart, beamInfo3D)
-fig_3d_slider.show()
-#     st.plotly_chart(fig_3d_slider, width = 1100, height = 800)
\ No newline at end of file
+fig_3d_slider = plot_3D_settlement_slider_animated(beam3D, plot3dAnno)
+#     st.plotly_chart(fig_3d_slider, width = 1100, height = 800)
+
+# Only open the figures in the browser when run as a script, not when imported
+if __name__ == "__main__":
+    fig_floorElev_plan.show()
+    fig_3d_slider.show()
@@ -16,27 +16,30 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import scipy.stats as stats
-import plotly.express as px
 import plotly.graph_objects as go
-import datetime as dt
+import os
+from types import SimpleNamespace
 
 
-# import survey dataframe and return clean version
-def read_survey(surveyfile):
+# import survey dataframe and return clean version, mtime is only part of the cache key so an edited file is read again
+@st.cache_data(show_spinner=False)
+def read_survey(surveyfile, mtime):
     survey = pd.read_csv(surveyfile, skiprows=[1], nrows=36)
     
     # rename second 2010/11/2 survey to 2010/11/3
     survey_clean = survey.drop(columns=["DESCRIPTION", "Shims\nNote 13", "Unnamed: 52", "Delta"]).rename(columns={"MONITOR\nPOINT":"MONITOR_POINT"})
     survey_clean = survey_clean.set_index('MONITOR_POINT').rename_axis('date', axis=1)
     survey_clean.columns = pd.to_datetime(survey_clean.columns).astype(str)
+    # Order the surveys by date once, the forecast takes the most recent surveys from the end
+    survey_clean = survey_clean.sort_index(axis=1)
 
     # Transpose so dates are in index column
     survey_long = pd.DataFrame.transpose(survey_clean)
     return survey_clean, survey_long
 
-# import lug to truss measurements
-def read_trussHeight(trussfile):
+# import lug to truss measurements, mtime is only part of the cache key like read_survey
+@st.cache_data(show_spinner=False)
+def read_trussHeight(trussfile, mtime):
     truss = pd.read_csv(trussfile, skiprows=[1], nrows=36)
     # Clean up the imported truss to survey point file 
     truss_clean = truss.rename(columns={"MONITOR\nPOINT":"MONITOR_POINT"}).set_index('MONITOR_POINT').rename_axis('date', axis=1)
@@ -54,6 +57,8 @@ def read_xlElev(xlfile):
     # rename second 2010/11/2 survey to 2010/11/3
     survey_clean = survey.dropna(axis=1, how='all').drop(columns=["DESCRIPTION", "Shims\nNote 13", "Delta"]).rename(columns={"MONITOR\nPOINT":"MONITOR_POINT", "2010-11-02 00:00:00.1":'2010-11-03 00:00:00'}).set_index('MONITOR_POINT').rename_axis('date', axis=1)
     survey_clean.columns = pd.to_datetime(survey_clean.columns).astype(str)
+    # Order the surveys by date once, the forecast takes the most recent surveys from the end
+    survey_clean = survey_clean.sort_index(axis=1)
 
     # Transpose so dates are in index column
     survey_long = pd.DataFrame.transpose(survey_clean)
@@ -71,9 +76,20 @@ def read_xlTruss(xlfile):
     truss_clean.columns = pd.to_datetime(truss_clean.columns).astype(str)
     return truss_clean
 
+# import the survey and lug to truss sheets from a single open workbook
+@st.cache_data(show_spinner=False, max_entries=10)
+def read_xl(xlfile):
+    # pandas' openpyxl engine already opens the workbook read_only and data_only
+    with pd.ExcelFile(xlfile, engine='openpyxl') as xl:
+        survey_clean, survey_long = read_xlElev(xl)
+        truss_clean = read_xlTruss(xl)
+    return survey_clean, survey_long, truss_clean
+
 # import beam information and label location
+@st.cache_data(show_spinner=False)
 def read_beamInfo():
-    beamfile = 'https://raw.githubusercontent.com/wyattreis/SouthPoleStationFoundation/main/SP_BeamArrowLabels.csv'
+    # Read the copy bundled with the app rather than fetching it from GitHub on every launch
+    beamfile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'SP_BeamArrowLabels.csv')
     beamInfo = pd.read_csv(beamfile)
     beamLength = beamInfo[['MP_W_S', 'MP_E_N', 'beamName', 'beamLength']].dropna()
     MPlocations = beamInfo[['MP_W_S', 'mpX', 'mpY']].rename(columns={"MP_W_S":"MONITOR_POINT"}).dropna().set_index('MONITOR_POINT')
@@ -83,15 +99,38 @@ def read_beamInfo():
     beamLength_long.set_index('MONITOR_POINT', inplace = True)
     beamLength_sort = beamLength_long.drop(columns=['beamEnd']).sort_values('beamName').set_index('beamName')
     beamLength_sort = beamLength_sort[~beamLength_sort.index.duplicated(keep='first')]
-    return beamInfo, beamLength, MPlocations, beamLength_long, beamLength_sort
+
+    # Plan view plotting coordinates as one array per column, the plotting functions read these directly instead of Series
+    beamGeom = SimpleNamespace(**{col: beamInfo[col].to_numpy() for col in ['MP_W_S', 'startX', 'startY', 'endX', 'endY',
+                                                                            'labelX', 'labelY', 'arrowX', 'arrowY']})
+    # Labels as fixed width strings, an object array hashes by its pointers so the cached figure builders would never hit
+    beamGeom.MP_W_S = beamGeom.MP_W_S.astype(str)
+
+    # All beams as one outline, a NaN point after each beam end breaks the line between beams
+    gap = np.full(beamGeom.startX.shape, np.nan)
+    beamGeom.lineX = np.column_stack([beamGeom.startX, beamGeom.endX, gap]).ravel()
+    beamGeom.lineY = np.column_stack([beamGeom.startY, beamGeom.endY, gap]).ravel()
+
+    # Row position of the west/south and east/north Monitoring Point of each beam in MPlocations
+    mpPosition = {mp: i for i, mp in enumerate(MPlocations.index)}
+    beamStartIdx = beamLength['MP_W_S'].map(mpPosition)
+    beamEndIdx = beamLength['MP_E_N'].map(mpPosition)
+
+    # A beam end without a monitoring point location maps to NaN, name it here rather than failing later as an IndexError
+    missingMP = pd.concat([beamLength['MP_W_S'][beamStartIdx.isna()], beamLength['MP_E_N'][beamEndIdx.isna()]]).unique()
+    if len(missingMP) > 0:
+        raise ValueError(f"Beam end monitoring points missing from the MP locations in SP_BeamArrowLabels.csv: {', '.join(map(str, missingMP))}")
+    beamStartIdx = beamStartIdx.to_numpy().astype(int)
+    beamEndIdx = beamEndIdx.to_numpy().astype(int)
+    return beamInfo, beamLength, MPlocations, beamLength_long, beamLength_sort, beamGeom, beamStartIdx, beamEndIdx
 
 # Calculate the cumulative settlement in feet for each column by survey data
+@st.cache_data(show_spinner=False, max_entries=10)
 def calc_settlement(survey_long):
-    survey_long['dummy']= 1
-    firstValue = survey_long.groupby('dummy').first()
-    firstValue = firstValue.to_numpy()[0]
+    # First surveyed elevation of each monitoring point, skipping points missing from the earliest surveys
+    firstValue = survey_long.bfill().iloc[0].to_numpy(dtype=float)
 
-    settlement = survey_long.drop(columns=["dummy"]).apply(lambda row: firstValue - row, axis=1)
+    settlement = pd.DataFrame(firstValue - survey_long.to_numpy(dtype=float), index=survey_long.index, columns=survey_long.columns)
     settlement.index = pd.to_datetime(settlement.index)
     settlement_points = pd.DataFrame.transpose(settlement)
 
@@ -100,86 +139,80 @@ def calc_settlement(survey_long):
     settlement_delta_MP = pd.DataFrame.transpose(settlement_delta)
 
     # Calculate the annual settlement rate for each column 
-    diffDays = pd.DataFrame(index=settlement_delta.index)
-    diffDays["diffDays"] = settlement_delta.index.to_series().diff().dt.days
-
-    settlement_rate = settlement_delta.iloc[:,:].div(diffDays.diffDays, axis=0).mul(365)
+    diffDays = settlement_delta.index.to_series().diff().dt.days
+    settlement_rate = settlement_delta.div(diffDays, axis=0).mul(365)
     return settlement, settlement_points, settlement_delta, settlement_delta_MP, settlement_rate
 
+# Least squares fit of the last nsurvey surveys, cached apart from the projection so changing nyears reuses the fit
+@st.cache_data(show_spinner=False, max_entries=10)
+def calc_forecast_fit(settlement, nsurvey):
+    settlementInterp = settlement.iloc[-nsurvey:]
+
+    # Survey dates as day numbers, converted for the whole index at once
+    surveyDays = settlementInterp.index.values.astype('datetime64[D]')
+
+    # Least squares slope and intercept for every monitoring point at once, using the mean-centered survey dates
+    x = surveyDays.astype(np.int64).astype(float)
+    y = settlementInterp.to_numpy(dtype=float)
+    xCentered = x - x.mean()
+    slope = xCentered @ (y - y.mean(axis=0)) / (xCentered @ xCentered)
+    intercept = y.mean(axis=0) - slope*x.mean()
+    return surveyDays, slope, intercept
+
 # Cumulative Settlement Forecasting
+@st.cache_data(show_spinner=False, max_entries=10)
 def calc_forecast_settlement(settlement, nsurvey, nyears):
-    settlementInterp = settlement.iloc[(len(settlement.index)-(nsurvey)):(len(settlement.index))]
-    currentYear = settlementInterp.index.year[-1]
-
-    projList = []
-    for year in range(nyears):
-        projYear = (currentYear + year+1).astype(str)
-        projYear = pd.to_datetime(projYear + '-01-01') 
-        projList.append(projYear)
-
-    settlementExtrap = pd.DataFrame(columns=settlementInterp.columns, index = [projList]).reset_index().set_index('level_0')
-    settlementExtrap.index = settlementExtrap.index.map(dt.datetime.toordinal)
-    settlementInterp.index = settlementInterp.index.map(dt.datetime.toordinal)
-
-    x_endpoints = list([settlementInterp.index[0], settlementInterp.index[nsurvey-1]]) + settlementExtrap.index.tolist()
-    x_enddates = pd.DataFrame(x_endpoints)
-
-    df_regression = settlementInterp.apply(lambda x: stats.linregress(settlementInterp.index, x), result_type='expand').rename(index={0: 'slope', 1: 
-                                                                                    'intercept', 2: 'rvalue', 3:
-                                                                                    'p-value', 4:'stderr'})
-
-    new_data_loc = {}
-    for column in df_regression.columns:   
-        slope = df_regression.loc['slope', column]  
-        intercept = df_regression.loc['intercept', column]  
-        new_data_loc[column] = [slope * val + intercept for val in x_endpoints]
-
-    settlementProj = pd.DataFrame([new_data_loc], columns=new_data_loc.keys()).apply(pd.Series.explode).reset_index().drop(['index'], axis = 1)
-    settlementProj = x_enddates.join(settlementProj).set_index(0)
-    settlementProj.index.names = ['date']
-    settlementProj.index = settlementProj.index.map(dt.datetime.fromordinal)
-    settlementProj = settlementProj.apply(pd.to_numeric, errors='ignore').round(3)
-
-    settlementProj_trans = settlementProj
-    settlementProj_trans.index = settlementProj_trans.index.strftime('%Y-%m-%d') 
-    settlementProj_trans = pd.DataFrame.transpose(settlementProj_trans).iloc[:,2:]
-    return settlementProj, settlementProj_trans
+    surveyDays, slope, intercept = calc_forecast_fit(settlement, nsurvey)
 
-# Calculate differental settlement
-def calc_differental_settlement(beamLength_long, beamLength_sort, survey_clean, beamInfo, settlementProj_trans):
-    # Merge the beam file and the settlement file
-    beamSettlement = beamLength_long.join(survey_clean)
+    # First and last fitted survey and January 1st of each forecast year
+    projDays = (surveyDays[-1].astype('datetime64[Y]') + np.arange(1, nyears+1)).astype('datetime64[D]')
+    x_enddates = np.concatenate([surveyDays[[0, -1]], projDays])
+    x_endpoints = x_enddates.astype(np.int64)
 
-    # Merge the beam file and the projected settlement file
-    beamSettlementProj = beamLength_long.join(settlementProj_trans)
+    # Project every monitoring point to the end points and forecast years at once with an outer product
+    projArr = (np.outer(x_endpoints, slope) + intercept).round(3)
+    projDates = pd.DatetimeIndex(x_enddates, name='date').strftime('%Y-%m-%d')
+    settlementProj = pd.DataFrame(projArr, index=projDates, columns=settlement.columns.rename(None))
 
-    # Group by beamName, difference, and convert to inches, keep only the differenced values
-    beamDiff = beamSettlement.set_index(['beamName']).sort_values(by=['beamName', 'beamEnd']).drop(columns=['beamEnd', 'beamLength']).groupby(['beamName']).diff().mul(12)
-    beamDiff = beamDiff[~beamDiff.index.duplicated(keep='last')]
+    # Forecast years with monitoring points as rows for the beam and 3D calculations, built from the array rather than transposing the frame
+    settlementProj_trans = pd.DataFrame(projArr[2:].T, index=settlementProj.columns, columns=projDates[2:])
+    return settlementProj, settlementProj_trans
+
+# Calculate differental settlement
+@st.cache_data(show_spinner=False, max_entries=10)
+def calc_differental_settlement(beamLength, beamLength_sort, MPlocations, beamStartIdx, beamEndIdx, survey_clean, beamInfo, settlementProj_trans):
+    # Order the survey and projected settlement by MPlocations so the beam end positions index straight into the arrays
+    surveyElev = survey_clean.reindex(MPlocations.index).to_numpy()
+    projSettlement = settlementProj_trans.reindex(MPlocations.index).to_numpy()
+
+    beamIndex = pd.Index(beamLength['beamName'], name='beamName')
+    beamLengthArr = beamLength['beamLength'].to_numpy()[:, None]
+
+    # Difference the west/south and east/north end of each beam, convert to inches
+    beamDiffArr = (surveyElev[beamStartIdx] - surveyElev[beamEndIdx])*12
+    beamDiff = pd.DataFrame(beamDiffArr, index=beamIndex, columns=survey_clean.columns)
     beamDiff.columns = pd.to_datetime(beamDiff.columns).astype(str)
     beamDiffplot = beamInfo[['beamName', 'beamX', 'beamY']].dropna().set_index(['beamName']).join(beamDiff)
     beamDiff = beamDiffplot.drop(columns=['beamX', 'beamY'])
 
     # Projected beam settlement differences 
-    beamDiffProj = beamSettlementProj.set_index(['beamName']).sort_values(by=['beamName', 'beamEnd']).drop(columns=['beamEnd', 'beamLength']).groupby(['beamName']).diff().mul(12)
-    beamDiffProj = beamDiffProj[~beamDiffProj.index.duplicated(keep='last')]
-    beamDiffProj.columns = pd.to_datetime(beamDiffProj.columns).astype(str)
+    beamDiffProjArr = (projSettlement[beamStartIdx] - projSettlement[beamEndIdx])*12
+    projColumns = pd.to_datetime(settlementProj_trans.columns).astype(str)
 
-    # Calculate the slope for each beam, transpose for ploting 
-    beamSlope = beamLength_sort.join(beamDiff)
-    beamSlope.iloc[:,1:] = beamSlope.iloc[:,1:].div(beamSlope.beamLength, axis=0)
+    # Calculate the slope for each beam, dividing the beam ordered differences by the beam lengths at once, transpose for ploting 
+    beamSlope = beamLength_sort.join(pd.DataFrame(beamDiffArr/beamLengthArr, index=beamIndex, columns=beamDiff.columns))
     beamSlopeplot = beamInfo[['beamName', 'beamX', 'beamY']].dropna().set_index(['beamName']).join(beamSlope)
     beamSlope = beamSlopeplot.drop(columns=['beamX', 'beamY', 'beamLength'])
 
     # Calculate the projected slope for each beam 
-    beamSlopeProj = beamLength_sort.join(beamDiffProj)
-    beamSlopeProj.iloc[:,1:] = beamSlopeProj.iloc[:,1:].div(beamSlopeProj.beamLength, axis=0)
-    beamSlopeProj= beamSlopeProj.drop(columns=['beamLength'])
+    beamSlopeProj = pd.DataFrame(beamDiffProjArr/beamLengthArr, index=beamIndex, columns=projColumns)
+    beamSlopeProj = beamLength_sort.join(beamSlopeProj).drop(columns=['beamLength'])
     return beamDiff, beamDiffplot, beamSlope, beamSlopeplot, beamSlopeProj
 
 # Create dataframes for planview plotting 
 # (lug and floor elevations, lug to truss measurement, differential settlement)
-def calc_plan_dataframe (survey_clean, truss_clean, MPlocations, beamLength_long, beamLength_sort, beamInfo):
+@st.cache_data(show_spinner=False, max_entries=10)
+def calc_plan_dataframe (survey_clean, truss_clean, MPlocations, beamLength, beamLength_sort, beamStartIdx, beamEndIdx, beamInfo):
     # Lug elevation for each survey date
     lugElevPlot = MPlocations.join(survey_clean)
 
@@ -191,42 +224,66 @@ def calc_plan_dataframe (survey_clean, truss_clean, MPlocations, beamLength_long
     floorElev_clean = floorElev.dropna(axis=1, how='all')
     floorElevPlot = MPlocations.join(floorElev_clean)
 
-    # Calculate the elevation difference of the floor at each column
-    floorSettlement = beamLength_long.join(floorElev_clean)
-    floorDiff = floorSettlement.set_index(['beamName']).sort_values(by=['beamName', 'beamEnd']).drop(columns=['beamEnd', 'beamLength']).groupby(['beamName']).diff().mul(12)
-    floorDiff = floorDiff[~floorDiff.index.duplicated(keep='last')]
-    floorDiff.columns = pd.to_datetime(floorDiff.columns).astype(str)
+    # Calculate the elevation difference of the floor at each column, differencing the beam ends by their position in MPlocations
+    floorElevArr = floorElev_clean.reindex(MPlocations.index).to_numpy()
+    floorDiffArr = (floorElevArr[beamStartIdx] - floorElevArr[beamEndIdx])*12
+    beamIndex = pd.Index(beamLength['beamName'], name='beamName')
+    floorColumns = pd.to_datetime(floorElev_clean.columns).astype(str).rename(None)
+    floorDiff = pd.DataFrame(floorDiffArr, index=beamIndex, columns=floorColumns).sort_index()
     floorDiffplot = beamInfo[['beamName', 'beamX', 'beamY']].dropna().set_index(['beamName']).join(floorDiff)
 
-    # Calculate the floor slope between columns 
-    floorSlope = beamLength_sort.join(floorDiff)
-    floorSlope.iloc[:,1:] = floorSlope.iloc[:,1:].div(floorSlope.beamLength, axis=0)
+    # Calculate the floor slope between columns, dividing the beam ordered differences by the beam lengths at once
+    floorSlope = beamLength_sort.join(pd.DataFrame(floorDiffArr/beamLength['beamLength'].to_numpy()[:, None], index=beamIndex, columns=floorColumns))
     floorSlopeplot = beamInfo[['beamName', 'beamX', 'beamY']].dropna().set_index(['beamName']).join(floorSlope)
     return lugElevPlot, lugFloorPlot, floorElevPlot, floorDiff, floorDiffplot, floorSlope, floorSlopeplot
 
-# Create dataframe for 3D plotting
+# Create arrays for 3D plotting, one row per survey or forecast date (animation frame) and one column per beam
+@st.cache_data(show_spinner=False, max_entries=10)
 def calc_3d_dataframe(beamInfo, settlement_points, settlementProj_trans, beamSlopeColor, beamSlopeProjColor):
-    beamStart = beamInfo[['MP_W_S', 'beamName']].set_index('MP_W_S')
-    settlementStart = beamStart.join(settlement_points).set_index('beamName')
-    settlementStart.columns = pd.to_datetime(settlementStart.columns).astype(str)
-    settlementProjStart = beamStart.join(settlementProj_trans).set_index('beamName')
-    settlementStart = settlementStart.join(settlementProjStart)
-
-    beamEnd = beamInfo[['MP_E_N', 'beamName']].set_index('MP_E_N')
-    settlementEnd = beamEnd.join(settlement_points).set_index('beamName')
-    settlementEnd.columns = pd.to_datetime(settlementEnd.columns).astype(str)
-    settlementProjEnd = beamEnd.join(settlementProj_trans).set_index('beamName')
-    settlementEnd = settlementEnd.join(settlementProjEnd)
-
-    settlement3D = settlementStart.join(settlementEnd, lsuffix='_start', rsuffix='_end')
-
-    beamInfo3D = beamInfo.loc[:, ['beamName','MP_W_S','startX', 'startY', 'endX','endY','labelX', 'labelY']].set_index('beamName')
-    beamInfo3D = beamInfo3D.join(settlement3D)
-    beamInfo3D = beamInfo3D[beamInfo3D.index.notnull()]
-    beamInfo3D = beamInfo3D.join(beamSlopeColor).join(beamSlopeProjColor)
-    return settlementStart, beamInfo3D
+    # Beam coordinates as arrays
+    beams = beamInfo[beamInfo['beamName'].notnull()]
+    beam3D = SimpleNamespace(**{col: beams[col].to_numpy() for col in ['MP_W_S', 'startX', 'startY', 'endX', 'endY', 'labelX', 'labelY']})
+    # Labels and colors as fixed width strings, for the same hashing reason as beamGeom in read_beamInfo
+    beam3D.MP_W_S = beam3D.MP_W_S.astype(str)
+    obsDates = pd.to_datetime(settlement_points.columns).astype(str)
+    projDates = settlementProj_trans.columns
+    beam3D.dates = obsDates.tolist() + projDates.tolist()
+
+    # Settlement at each beam end and the beam color for all dates, gathering the observed and projected arrays and stacking them instead of joining the frames
+    beam3D.startZ = np.hstack([settlement_points.reindex(beams['MP_W_S']).to_numpy(), settlementProj_trans.reindex(beams['MP_W_S']).to_numpy()]).T
+    beam3D.endZ = np.hstack([settlement_points.reindex(beams['MP_E_N']).to_numpy(), settlementProj_trans.reindex(beams['MP_E_N']).to_numpy()]).T
+    beam3D.color = np.hstack([beamSlopeColor.reindex(index=beams['beamName'], columns=obsDates).to_numpy(),
+                              beamSlopeProjColor.reindex(index=beams['beamName'], columns=projDates).to_numpy()]).T.astype(str)
+
+    # All beams as one line per date, a NaN point after each beam end breaks the line between beams
+    gap = np.full(beam3D.startX.shape, np.nan)
+    beam3D.lineX = np.column_stack([beam3D.startX, beam3D.endX, gap]).ravel()
+    beam3D.lineY = np.column_stack([beam3D.startY, beam3D.endY, gap]).ravel()
+    beam3D.lineZ = np.stack([beam3D.startZ, beam3D.endZ, np.full(beam3D.startZ.shape, np.nan)], axis=-1).reshape(len(beam3D.dates), -1)
+    beam3D.lineColor = np.repeat(beam3D.color, 3, axis=1)
+
+    # Deepest final forecast of the labelled monitoring points sets the settlement axis range
+    lastSettlement = settlementProj_trans.iloc[:, -1] if len(projDates) else settlement_points.iloc[:, -1]
+    beam3D.maxSettlement = lastSettlement.reindex(beamInfo['MP_W_S'].dropna()).max()
+    return beam3D
+
+# Bin edges and styles shared by the beam and floor plotting styles, bins are closed on the left like the survey criteria
+diffEdges = np.array([1.5, 2])
+diffColors = np.array(['black', 'orange', 'red'])
+slopeEdges = np.array([1/32, 1/16, 1/8])
+slopeColors = np.array(['black', 'gold', 'orange', 'red'])
+slopeProjColors = np.array(['green', 'teal', 'blue', 'purple'])
+symbolEdges = np.array([0])
+symbolStyles = np.array(['circle-open', 'triangle-right'])
+
+# Look up the style of every absolute value by its bin, missing values get nanStyle
+def lookup_styles(values, edges, styles, nanStyle, side='right'):
+    absValues = np.abs(values.to_numpy(dtype=float))
+    lookup = np.where(np.isnan(absValues), nanStyle, styles[np.searchsorted(edges, absValues, side=side)])
+    return pd.DataFrame(lookup, index = values.index, columns = values.columns)
 
 # Line styles for beam plots
+@st.cache_data(show_spinner=False, max_entries=10)
 def plot_beamStyles(beamInfo, beamDiff, beamSlope, beamSlopeProj):
     #---------BEAM Plotting Styles--------------------------------
     # Calculate the direction of arrow of each beam
@@ -234,36 +291,26 @@ def plot_beamStyles(beamInfo, beamDiff, beamSlope, beamSlopeProj):
     beamDir = pd.DataFrame(np.where(beamDiff >= 0, 0, 180), index = beamDiff.index, columns = beamDiff.columns)
     beamDir = beamDirLabels.join(beamDir).dropna()
 
-    # Add 90 degrees to the vertical columns, leave horizontal columns as is
-    cols = beamDir.columns[1:]
-    for col in cols:
-        beamDir.loc[beamDir['beamDir'] != 'h', col] -= 90
-    
-    beamDir = beamDir.drop(columns=['beamDir'])
+    # Add 90 degrees to the vertical columns, leave horizontal columns as is, broadcasting over every survey at once
+    vertical = (beamDir['beamDir'] != 'h').to_numpy()[:, None]
+    beamDir = beamDir.drop(columns=['beamDir']) - 90*vertical
     beamDir.columns = pd.to_datetime(beamDir.columns).astype(str)
 
-    # Create dataframe for conditional text color for differental settlement values
-    conditions = [abs(beamDiff)>0, abs(beamDiff)==0]
-    choices = ['triangle-right', 'circle-open']
-    beamSymbol = pd.DataFrame(np.select(conditions, choices, default=np.nan), index = beamDiff.index, columns = beamDiff.columns).replace('nan','x')
+    # Create dataframe for conditional marker symbol for differental settlement values
+    beamSymbol = lookup_styles(beamDiff, symbolEdges, symbolStyles, 'x', side='left')
 
     # Create dataframe for conditional text color for differental settlement values
-    conditions = [abs(beamDiff)<1.5, (abs(beamDiff)>=1.5) & (abs(beamDiff)<2), abs(beamDiff)>=2]
-    choices = ['black', 'orange', 'red']
-    beamDiffColor = pd.DataFrame(np.select(conditions, choices, default=np.nan), index = beamDiff.index, columns = beamDiff.columns).replace('nan','blue')
+    beamDiffColor = lookup_styles(beamDiff, diffEdges, diffColors, 'blue')
 
     # Create dataframe for conditional text color for differental settlement slope values
-    conditions = [abs(beamSlope)<(1/32), (abs(beamSlope)>=(1/32)) & (abs(beamSlope)<(1/16)), (abs(beamSlope)>=(1/16)) & (abs(beamSlope)<(1/8)), abs(beamDiff)>=(1/8)]
-    choices = ['black','gold', 'orange', 'red']
-    beamSlopeColor = pd.DataFrame(np.select(conditions, choices, default=np.nan), index = beamDiff.index, columns = beamDiff.columns).replace('nan','blue')
+    beamSlopeColor = lookup_styles(beamSlope, slopeEdges, slopeColors, 'blue')
     
     # Create dataframe for conditional text color for differental settlement slope values
-    conditions = [abs(beamSlopeProj)<(1/32), ((abs(beamSlopeProj)>=(1/32)) & (abs(beamSlopeProj)<(1/16))), ((abs(beamSlopeProj)>=(1/16)) & (abs(beamSlopeProj)<(1/8))), abs(beamSlopeProj)>=(1/8)]
-    choices = ['green','teal', 'blue', 'purple']
-    beamSlopeProjColor = pd.DataFrame(np.select(conditions, choices, default=np.nan), index = beamSlopeProj.index, columns = beamSlopeProj.columns).replace('nan','blue')
+    beamSlopeProjColor = lookup_styles(beamSlopeProj, slopeEdges, slopeProjColors, 'blue')
     return beamDirLabels, beamDir, beamSymbol, beamDiffColor, beamSlopeColor, beamSlopeProjColor
 
 # Line styles for floor plots
+@st.cache_data(show_spinner=False, max_entries=10)
 def plot_floorStyles(beamDirLabels, beamInfo, floorDiff, floorDiffplot, floorSlope, floorSlopeplot):
     #-----------FLOOR ANNOTATIONS------------------------------
     # Calculate the direction of arrow of the floor
@@ -271,33 +318,25 @@ def plot_floorStyles(beamDirLabels, beamInfo, floorDiff, floorDiffplot, floorSlo
     floorDir = beamDirLabels.join(floorDir).dropna()
 
     # Add 90 degrees to the vertical columns, leave horizontal columns as is - for the floor
-    cols = floorDir.columns[1:]
-    for col in cols:
-        floorDir.loc[floorDir['beamDir'] != 'h', col] -= 90
-        
-    floorDir = floorDir.drop(columns=['beamDir'])
+    vertical = (floorDir['beamDir'] != 'h').to_numpy()[:, None]
+    floorDir = floorDir.drop(columns=['beamDir']) - 90*vertical
     floorDir.columns = pd.to_datetime(floorDir.columns).astype(str)
 
     # Create dataframe for conditional marker symbol for floor differental settlement
-    conditions = [abs(floorDiff.round(2))>0, abs(floorDiff.round(2))==0]
-    choices = ['triangle-right','circle-open']
-    floorSymbol = pd.DataFrame(np.select(conditions, choices, default=np.nan), index = floorDiff.index, columns = floorDiff.columns).replace('nan','x')
+    floorSymbol = lookup_styles(floorDiff.round(2), symbolEdges, symbolStyles, 'x', side='left')
     floorSymbolplot = beamInfo[['beamName', 'arrowX', 'arrowY']].dropna().set_index(['beamName']).join(floorSymbol)
 
     # Create dataframe for conditional text color for floor differental settlement values
-    conditions = [abs(floorDiff)<1.5, (abs(floorDiff)>=1.5) & (abs(floorDiff)<2), abs(floorDiff)>=2]
-    choices = ['black', 'orange', 'red']
-    floorDiffColor = pd.DataFrame(np.select(conditions, choices, default=np.nan), index = floorDiff.index, columns = floorDiff.columns).replace('nan','blue')
+    floorDiffColor = lookup_styles(floorDiff, diffEdges, diffColors, 'blue')
     floorDiffColorplot = floorDiffplot.join(floorDiffColor, rsuffix='_color')
 
     # Create dataframe for conditional text color for differental settlement slope values
-    conditions = [abs(floorSlope)<(1/32), ((abs(floorSlope)>=(1/32)) & (abs(floorSlope)<(1/16))), ((abs(floorSlope)>=(1/16)) & (abs(floorSlope)<(1/8))), abs(floorSlope)>=(1/8)]
-    choices = ['black','gold', 'orange', 'red']
-    floorSlopeColor = pd.DataFrame(np.select(conditions, choices, default=np.nan), index = floorSlope.index, columns = floorSlope.columns).replace('nan','blue')
+    floorSlopeColor = lookup_styles(floorSlope, slopeEdges, slopeColors, 'blue')
     floorSlopeColorplot = floorSlopeplot.join(floorSlopeColor, rsuffix='_color')
     return floorDir, floorSymbolplot, floorDiffColorplot, floorSlopeColorplot
     
-# Plot annotations
+# Plot annotations, constant so they are built once and shared across reruns
+@st.cache_resource(show_spinner=False)
 def plot_annotations():
     #----------PLOT NOTES AND ANNOTATIONS-----------------------
     beamDiffAnno = list([
@@ -514,35 +553,39 @@ def plot_annotations():
     return beamDiffAnno, beamSlopeAnno, diffAnno, slopeAnno, plot3dAnno, color_dict, maps
 
 # Plot Cumulative Settlement
+@st.cache_resource(show_spinner=False, max_entries=10)
 def plot_cumulative_settlement(settlement, settlementProj, color_dict, maps):
     df = settlement 
 
-    # plotly figure
-    fig = go.Figure()
-
+    # plotly figure, traces as plain dicts validated once by go.Figure
+    traces = []
     for column in df:
-            fig.add_trace(go.Scatter(
+            traces.append(dict(
+                type = 'scatter',
                 x=df.index,
                 y=df[column],
                 name= column,
                 mode = 'lines+markers',
-                marker_color = color_dict[column]
+                marker = dict(
+                    color = color_dict[column])
             ))
 
     for column in settlementProj:
-            fig.add_trace(go.Scatter(
+            traces.append(dict(
+                type = 'scatter',
                 x=settlementProj.index,
                 y=settlementProj[column],
                 name= column + ' Projection',
                 mode = 'lines+markers',
-                marker_color = color_dict[column],
                 line = dict(
                     width = 1.5,
                     dash = 'dash'),
                 marker = dict(
+                    color = color_dict[column],
                     size=7.5,
                     symbol='star'),
             ))
+    fig = go.Figure(data=traces)
             
     fig.update_layout(xaxis_title="Survey Date",
                     yaxis_title="Cumulative Settlement [ft]")
@@ -595,21 +638,21 @@ def plot_cumulative_settlement(settlement, settlementProj, color_dict, maps):
     return fig
 
 # Plot Delta Settlement
+@st.cache_resource(show_spinner=False, max_entries=10)
 def plot_delta_settlement(settlement_delta, color_dict, maps):
      # Plot Change in Settlement between each survey
     df = settlement_delta #change based on dataframe to plot
 
-    # plotly figure
-    fig = go.Figure()
-
-    for column in df:
-        fig.add_trace(go.Scatter(
+    # plotly figure, traces as plain dicts validated once by go.Figure
+    fig = go.Figure(data=[dict(
+            type = 'scatter',
             x=df.index,
             y=df[column],
             name= column,
             mode = 'lines+markers',
-            marker_color = color_dict[column]
-        ))
+            marker = dict(
+                color = color_dict[column])
+        ) for column in df])
 
     fig.update_layout(xaxis_title="Survey Date",
                  yaxis_title="Settlement Change [in]")
@@ -661,19 +704,20 @@ def plot_delta_settlement(settlement_delta, color_dict, maps):
     return fig
 
 # Plot settlement rate between each survey
+@st.cache_resource(show_spinner=False, max_entries=10)
 def plot_settlementRate(settlement_rate, color_dict, maps):
     df = settlement_rate
 
-    fig = go.Figure()
-
-    for column in df:
-            fig.add_trace(go.Scatter(
+    # plotly figure, traces as plain dicts validated once by go.Figure
+    fig = go.Figure(data=[dict(
+                type = 'scatter',
                 x=df.index,
                 y=df[column],
                 name= column,
                 mode = 'lines+markers',
-                marker_color = color_dict[column]
-            ))
+                marker = dict(
+                    color = color_dict[column])
+            ) for column in df])
 
     fig.update_layout(xaxis_title="Survey Date",
                     yaxis_title="Settlement [in/year]")
@@ -722,7 +766,8 @@ def plot_settlementRate(settlement_rate, color_dict, maps):
     return fig
 
 # Plot differental settlement in plan view
-def plot_DiffSettlement_plan(beamDiffplot, beamInfo, beamDiffColor, beamSymbol, beamDir, beamDiffAnno):
+@st.cache_resource(show_spinner=False, max_entries=10)
+def plot_DiffSettlement_plan(beamDiffplot, beamGeom, beamDiffColor, beamSymbol, beamDir, beamDiffAnno):
     df = beamDiffplot
 
     #create a figure from the graph objects (not plotly express) library
@@ -732,25 +777,24 @@ def plot_DiffSettlement_plan(beamDiffplot, beamInfo, beamDiffColor, beamSymbol,
     dates = []
     i = 0
 
-    # Plot the beam locations as lines
-    for (startX, endX, startY, endY) in zip(beamInfo['startX'], beamInfo['endX'], beamInfo['startY'], beamInfo['endY']):
-        fig.add_trace(go.Scatter(
-            x=[startX, endX],
-            y=[startY, endY],
-            mode='lines',
-            line = dict(
-                color = 'black',
-                width = 1.5,
-                dash = 'solid'),
-            hoverinfo='skip',
-            showlegend=False
-        ))
+    # Plot the beam locations as a single line trace
+    fig.add_trace(go.Scatter(
+        x=beamGeom.lineX,
+        y=beamGeom.lineY,
+        mode='lines',
+        line = dict(
+            color = 'black',
+            width = 1.5,
+            dash = 'solid'),
+        hoverinfo='skip',
+        showlegend=False
+    ))
 
     # Plot the Marker Point (MP) labels in grey
     fig.add_trace(go.Scatter(
-        x=beamInfo['labelX'],
-        y=beamInfo['labelY'],
-        text=beamInfo['MP_W_S'],
+        x=beamGeom.labelX,
+        y=beamGeom.labelY,
+        text=beamGeom.MP_W_S,
         mode = 'text',
         textfont = dict(
             size = 12,
@@ -786,8 +830,8 @@ def plot_DiffSettlement_plan(beamDiffplot, beamInfo, beamDiffColor, beamSymbol,
             
             # Beam Differental Settlement Arrow - pointing in direction of low end 
         fig.add_trace(go.Scatter(
-            x=beamInfo['arrowX'],
-            y=beamInfo['arrowY'],
+            x=beamGeom.arrowX,
+            y=beamGeom.arrowY,
             mode = 'markers',
             #name = column,
             marker=dict(
@@ -807,7 +851,7 @@ def plot_DiffSettlement_plan(beamDiffplot, beamInfo, beamDiffColor, beamSymbol,
     visList = []
 
     for  i, col in enumerate(df.columns[2:]):
-        vis = [True]*(len(df.index)+2) + ([False]*i*2 + [True]*2 + [False]*(len(df.columns)-2-(i+1))*2)
+        vis = [True]*2 + ([False]*i*2 + [True]*2 + [False]*(len(df.columns)-2-(i+1))*2)
         visList.append(vis)
         vis = []
 
@@ -851,7 +895,8 @@ def plot_DiffSettlement_plan(beamDiffplot, beamInfo, beamDiffColor, beamSymbol,
     return fig
 
 # Plot differental settlement slope in plan view
-def plot_SlopeSettlement_plan(beamSlopeplot, beamInfo, beamSlopeColor, beamSymbol, beamDir, beamSlopeAnno):
+@st.cache_resource(show_spinner=False, max_entries=10)
+def plot_SlopeSettlement_plan(beamSlopeplot, beamGeom, beamSlopeColor, beamSymbol, beamDir, beamSlopeAnno):
     df = beamSlopeplot
 
     #create a figure from the graph objects (not plotly express) library
@@ -861,25 +906,24 @@ def plot_SlopeSettlement_plan(beamSlopeplot, beamInfo, beamSlopeColor, beamSymbo
     dates = []
     i = 0
 
-    # Plot the beam locations as lines
-    for (startX, endX, startY, endY) in zip(beamInfo['startX'], beamInfo['endX'], beamInfo['startY'], beamInfo['endY']):
-        fig.add_trace(go.Scatter(
-            x=[startX, endX],
-            y=[startY, endY],
-            mode='lines',
-            line = dict(
-                color = 'black',
-                width = 1.5,
-                dash = 'solid'),
-            hoverinfo='skip',
-            showlegend=False
-        ))
+    # Plot the beam locations as a single line trace
+    fig.add_trace(go.Scatter(
+        x=beamGeom.lineX,
+        y=beamGeom.lineY,
+        mode='lines',
+        line = dict(
+            color = 'black',
+            width = 1.5,
+            dash = 'solid'),
+        hoverinfo='skip',
+        showlegend=False
+    ))
 
     # Plot the Marker Point (MP) labels in grey
     fig.add_trace(go.Scatter(
-        x=beamInfo['labelX'],
-        y=beamInfo['labelY'],
-        text=beamInfo['MP_W_S'],
+        x=beamGeom.labelX,
+        y=beamGeom.labelY,
+        text=beamGeom.MP_W_S,
         mode = 'text',
         textfont = dict(
             size = 12,
@@ -914,8 +958,8 @@ def plot_SlopeSettlement_plan(beamSlopeplot, beamInfo, beamSlopeColor, beamSymbo
             
             # Beam Differental Settlement Arrow - pointing in direction of low end 
         fig.add_trace(go.Scatter(
-            x=beamInfo['arrowX'],
-            y=beamInfo['arrowY'],
+            x=beamGeom.arrowX,
+            y=beamGeom.arrowY,
             mode = 'markers',
             #name = column,
             marker=dict(
@@ -935,7 +979,7 @@ def plot_SlopeSettlement_plan(beamSlopeplot, beamInfo, beamSlopeColor, beamSymbo
     visList = []
 
     for  i, col in enumerate(df.columns[3:]):
-        vis = [True]*(len(df.index)+2) + ([False]*i*2 + [True]*2 + [False]*(len(df.columns)-(i+1))*2)
+        vis = [True]*2 + ([False]*i*2 + [True]*2 + [False]*(len(df.columns)-(i+1))*2)
         visList.append(vis)
         vis = []
 
@@ -979,7 +1023,8 @@ def plot_SlopeSettlement_plan(beamSlopeplot, beamInfo, beamSlopeColor, beamSymbo
     return fig
 
 # Plot the lug elevations
-def plot_lugElev_plan(lugElevPlot, beamInfo):
+@st.cache_resource(show_spinner=False, max_entries=10)
+def plot_lugElev_plan(lugElevPlot, beamGeom):
     df = lugElevPlot
 
     #create a figure from the graph objects (not plotly express) library
@@ -989,25 +1034,24 @@ def plot_lugElev_plan(lugElevPlot, beamInfo):
     dates = []
     i = 0
 
-    # Plot the beam locations as lines
-    for (startX, endX, startY, endY) in zip(beamInfo['startX'], beamInfo['endX'], beamInfo['startY'], beamInfo['endY']):
-        fig.add_trace(go.Scatter(
-            x=[startX, endX],
-            y=[startY, endY],
-            mode='lines',
-            line = dict(
-                color = 'black',
-                width = 1.5,
-                dash = 'solid'),
-            hoverinfo='skip',
-            showlegend=False
-        ))
+    # Plot the beam locations as a single line trace
+    fig.add_trace(go.Scatter(
+        x=beamGeom.lineX,
+        y=beamGeom.lineY,
+        mode='lines',
+        line = dict(
+            color = 'black',
+            width = 1.5,
+            dash = 'solid'),
+        hoverinfo='skip',
+        showlegend=False
+    ))
 
     # Plot the Marker Point (MP) labels in grey
     fig.add_trace(go.Scatter(
-        x=beamInfo['labelX'],
-        y=beamInfo['labelY'],
-        text=beamInfo['MP_W_S'],
+        x=beamGeom.labelX,
+        y=beamGeom.labelY,
+        text=beamGeom.MP_W_S,
         mode = 'text',
         textfont = dict(
             size = 10,
@@ -1060,7 +1104,7 @@ def plot_lugElev_plan(lugElevPlot, beamInfo):
     visList = []
 
     for  i, col in enumerate(df.columns[2:]):
-        vis = [True]*(54) + ([False]*i + [True] + [False]*((54)-2-(i+1)))
+        vis = [True]*2 + ([False]*i + [True] + [False]*(len(df.columns)-2-(i+1)))
         visList.append(vis)
         vis = []
 
@@ -1101,7 +1145,8 @@ def plot_lugElev_plan(lugElevPlot, beamInfo):
     return fig
 
 # Lug to Floor Height at monitoring points (measurement of shims)
-def plot_lugFloorHeight_plan(lugFloorPlot, beamInfo):
+@st.cache_resource(show_spinner=False, max_entries=10)
+def plot_lugFloorHeight_plan(lugFloorPlot, beamGeom):
     df = lugFloorPlot
 
     fig = go.Figure()
@@ -1110,25 +1155,24 @@ def plot_lugFloorHeight_plan(lugFloorPlot, beamInfo):
     dates = []
     i = 0
 
-    # Plot the beam locations as lines
-    for (startX, endX, startY, endY) in zip(beamInfo['startX'], beamInfo['endX'], beamInfo['startY'], beamInfo['endY']):
-        fig.add_trace(go.Scatter(
-            x=[startX, endX],
-            y=[startY, endY],
-            mode='lines',
-            line = dict(
-                color = 'black',
-                width = 1.5,
-                dash = 'solid'),
-            hoverinfo='skip',
-            showlegend=False
-        ))
+    # Plot the beam locations as a single line trace
+    fig.add_trace(go.Scatter(
+        x=beamGeom.lineX,
+        y=beamGeom.lineY,
+        mode='lines',
+        line = dict(
+            color = 'black',
+            width = 1.5,
+            dash = 'solid'),
+        hoverinfo='skip',
+        showlegend=False
+    ))
 
     # Plot the Marker Point (MP) labels in grey
     fig.add_trace(go.Scatter(
-        x=beamInfo['labelX'],
-        y=beamInfo['labelY'],
-        text=beamInfo['MP_W_S'],
+        x=beamGeom.labelX,
+        y=beamGeom.labelY,
+        text=beamGeom.MP_W_S,
         mode = 'text',
         textfont = dict(
             size = 10,
@@ -1181,7 +1225,7 @@ def plot_lugFloorHeight_plan(lugFloorPlot, beamInfo):
     visList = []
 
     for  i, col in enumerate(df.columns[2:]):
-        vis = [True]*(54) + ([False]*i + [True] + [False]*((54)-2-(i+1)))
+        vis = [True]*2 + ([False]*i + [True] + [False]*(len(df.columns)-2-(i+1)))
         visList.append(vis)
         vis = []
 
@@ -1222,7 +1266,8 @@ def plot_lugFloorHeight_plan(lugFloorPlot, beamInfo):
     return fig
 
 # Differential Floor Elevations (inches) between monitoring points
-def plot_floorDiffElev_plan(floorDiffColorplot, beamInfo, floorDiffplot, floorSymbolplot, floorDir, floorElevPlot, diffAnno):
+@st.cache_resource(show_spinner=False, max_entries=10)
+def plot_floorDiffElev_plan(floorDiffColorplot, beamGeom, floorDiffplot, floorSymbolplot, floorDir, floorElevPlot, diffAnno):
     df = floorDiffColorplot
 
     fig = go.Figure()
@@ -1231,25 +1276,24 @@ def plot_floorDiffElev_plan(floorDiffColorplot, beamInfo, floorDiffplot, floorSy
     dates = []
     i = 0
 
-    # Plot the beam locations as lines
-    for (startX, endX, startY, endY) in zip(beamInfo['startX'], beamInfo['endX'], beamInfo['startY'], beamInfo['endY']):
-        fig.add_trace(go.Scatter(
-            x=[startX, endX],
-            y=[startY, endY],
-            mode='lines',
-            line = dict(
-                color = 'black',
-                width = 1.5,
-                dash = 'solid'),
-            hoverinfo='skip',
-            showlegend=False
-        ))
+    # Plot the beam locations as a single line trace
+    fig.add_trace(go.Scatter(
+        x=beamGeom.lineX,
+        y=beamGeom.lineY,
+        mode='lines',
+        line = dict(
+            color = 'black',
+            width = 1.5,
+            dash = 'solid'),
+        hoverinfo='skip',
+        showlegend=False
+    ))
 
     # Plot the Marker Point (MP) labels in grey
     fig.add_trace(go.Scatter(
-        x=beamInfo['labelX'],
-        y=beamInfo['labelY'],
-        text=beamInfo['MP_W_S'],
+        x=beamGeom.labelX,
+        y=beamGeom.labelY,
+        text=beamGeom.MP_W_S,
         mode = 'text',
         textfont = dict(
             size = 10,
@@ -1338,7 +1382,7 @@ def plot_floorDiffElev_plan(floorDiffColorplot, beamInfo, floorDiffplot, floorSy
     visList = []
 
     for  i, col in enumerate(floorDiffplot.columns[2:]):
-        vis = [True]*(len(floorDiffplot.index)+2) + ([False]*i*3 + [True]*3 + [False]*(len(floorDiffplot.columns)-2-(i+1))*3)
+        vis = [True]*2 + ([False]*i*3 + [True]*3 + [False]*(len(floorDiffplot.columns)-2-(i+1))*3)
         visList.append(vis)
         vis = []
 
@@ -1381,7 +1425,8 @@ def plot_floorDiffElev_plan(floorDiffColorplot, beamInfo, floorDiffplot, floorSy
     return fig
 
 # Differential Floor Slope (inches/Foot) between monitoring points
-def plot_floorSlopeElev_plan(floorSlopeColorplot, beamInfo, floorSlopeplot, floorSymbolplot, floorElevPlot, floorDir, slopeAnno):
+@st.cache_resource(show_spinner=False, max_entries=10)
+def plot_floorSlopeElev_plan(floorSlopeColorplot, beamGeom, floorSlopeplot, floorSymbolplot, floorElevPlot, floorDir, slopeAnno):
     df = floorSlopeColorplot
 
     #create a figure from the graph objects (not plotly express) library
@@ -1391,25 +1436,24 @@ def plot_floorSlopeElev_plan(floorSlopeColorplot, beamInfo, floorSlopeplot, floo
     dates = []
     i = 0
 
-    # Plot the beam locations as lines
-    for (startX, endX, startY, endY) in zip(beamInfo['startX'], beamInfo['endX'], beamInfo['startY'], beamInfo['endY']):
-        fig.add_trace(go.Scatter(
-            x=[startX, endX],
-            y=[startY, endY],
-            mode='lines',
-            line = dict(
-                color = 'black',
-                width = 1.5,
-                dash = 'solid'),
-            hoverinfo='skip',
-            showlegend=False
-        ))
+    # Plot the beam locations as a single line trace
+    fig.add_trace(go.Scatter(
+        x=beamGeom.lineX,
+        y=beamGeom.lineY,
+        mode='lines',
+        line = dict(
+            color = 'black',
+            width = 1.5,
+            dash = 'solid'),
+        hoverinfo='skip',
+        showlegend=False
+    ))
 
     # Plot the Marker Point (MP) labels in grey
     fig.add_trace(go.Scatter(
-        x=beamInfo['labelX'],
-        y=beamInfo['labelY'],
-        text=beamInfo['MP_W_S'],
+        x=beamGeom.labelX,
+        y=beamGeom.labelY,
+        text=beamGeom.MP_W_S,
         mode = 'text',
         textfont = dict(
             size = 10,
@@ -1498,7 +1542,7 @@ def plot_floorSlopeElev_plan(floorSlopeColorplot, beamInfo, floorSlopeplot, floo
     visList = []
 
     for  i, col in enumerate(floorSlopeplot.columns[3:]):
-        vis = [True]*(len(floorSlopeplot.index)+2) + ([False]*i*3 + [True]*3 + [False]*(len(floorSlopeplot.columns)-(i+1))*3)
+        vis = [True]*2 + ([False]*i*3 + [True]*3 + [False]*(len(floorSlopeplot.columns)-(i+1))*3)
         visList.append(vis)
         vis = []
 
@@ -1541,66 +1585,59 @@ def plot_floorSlopeElev_plan(floorSlopeColorplot, beamInfo, floorSlopeplot, floo
     return fig
 
 # 3D Plot - settlement with a slider
-def plot_3D_settlement_slider(settlementStart, beamInfo3D):
+def plot_3D_settlement_slider(beam3D):
     fig = go.Figure()
 
-    for col in settlementStart.columns:
-        # Plot the beam locations as lines
-        for (startX, endX, startY, endY, startZ, endZ, startColor, endColor, mpLabel) in zip(beamInfo3D['startX'], beamInfo3D['endX'], 
-                                                                                    beamInfo3D['startY'], beamInfo3D['endY'], 
-                                                                                    beamInfo3D['{0}_start'.format(col)], 
-                                                                                    beamInfo3D['{0}_end'.format(col)],
-                                                                                    beamInfo3D[col],beamInfo3D[col], beamInfo3D['MP_W_S']):
-            fig.add_trace(go.Scatter3d(
-                x=[startX, endX],
-                y=[startY, endY],
-                z = [startZ, endZ],
-                text = mpLabel,
-                line_color= [startColor, endColor],
-                name="",
-                mode='lines',
-                line = dict(
-                    color = 'black',
-                    width = 1.5,
-                    dash = 'solid'),
-                showlegend=False, 
-                #setting only the first dataframe to be visible as default
-                visible = (col==settlementStart.columns[len(settlementStart.columns)-1]),
-                hovertemplate="<br>".join([
-                    #"MP: %{mpLabel}",
-                    "Settlement [ft]: %{z}"])
-                ))
-                   
-            # Plot the Marker Point (MP) labels in grey
-            fig.add_trace(go.Scatter3d(
-                x=beamInfo3D['labelX'],
-                y=beamInfo3D['labelY'],
-                z=beamInfo3D['{0}_start'.format(col)],
-                text=beamInfo3D['MP_W_S'],
-                mode = 'text',
-                textfont = dict(
-                    size = 10,
-                    color = 'grey'),
-                hoverinfo='skip',
-                showlegend=False, 
-                #setting only the first dataframe to be visible as default
-                visible = (col==settlementStart.columns[len(settlementStart.columns)-1])
-                ))
+    for i, col in enumerate(beam3D.dates):
+        # Plot the beam locations as a single line trace, each beam colored by its slope
+        fig.add_trace(go.Scatter3d(
+            x=beam3D.lineX,
+            y=beam3D.lineY,
+            z = beam3D.lineZ[i],
+            name="",
+            mode='lines',
+            line = dict(
+                color = beam3D.lineColor[i],
+                width = 1.5,
+                dash = 'solid'),
+            showlegend=False, 
+            #setting only the first dataframe to be visible as default
+            visible = (col==beam3D.dates[-1]),
+            hovertemplate="<br>".join([
+                #"MP: %{mpLabel}",
+                "Settlement [ft]: %{z}"])
+            ))
+               
+        # Plot the Marker Point (MP) labels in grey
+        fig.add_trace(go.Scatter3d(
+            x=beam3D.labelX,
+            y=beam3D.labelY,
+            z=beam3D.startZ[i],
+            text=beam3D.MP_W_S,
+            mode = 'text',
+            textfont = dict(
+                size = 10,
+                color = 'grey'),
+            hoverinfo='skip',
+            showlegend=False, 
+            #setting only the first dataframe to be visible as default
+            visible = (col==beam3D.dates[-1])
+            ))
         
     # groups and trace visibilities
     vis = []
     visList = []
 
-    for  i, col in enumerate(settlementStart.columns):
-        n = len(beamInfo3D.index)*2
-        vis = ([False]*i*n + [True]*n + [False]*(len(settlementStart.columns)-(i+1))*n)
+    for  i, col in enumerate(beam3D.dates):
+        n = 2
+        vis = ([False]*i*n + [True]*n + [False]*(len(beam3D.dates)-(i+1))*n)
         visList.append(vis)
         vis = []
 
 
     # buttons for each group
     steps = []
-    for idx, col in enumerate(settlementStart.columns):
+    for idx, col in enumerate(beam3D.dates):
         steps.append(
             dict(
                 label = col,
@@ -1609,7 +1646,7 @@ def plot_3D_settlement_slider(settlementStart, beamInfo3D):
         )
 
     sliders = [dict(
-        active=len(settlementStart.columns)-1,
+        active=len(beam3D.dates)-1,
         currentvalue={"prefix": "Survey Date: "},
         pad={"t": 20, "b":10},
         len = 0.945,
@@ -1623,7 +1660,7 @@ def plot_3D_settlement_slider(settlementStart, beamInfo3D):
         eye=dict(x=0, y=4, z=3)
     )
 
-    maxSettlement = settlementStart[settlementStart.columns[len(settlementStart.columns)-1]].max()
+    maxSettlement = beam3D.maxSettlement
     
     fig.update_layout(
         autosize=False,
@@ -1645,69 +1682,65 @@ def plot_3D_settlement_slider(settlementStart, beamInfo3D):
     )
     return fig
 
-def plot_3D_settlement_slider_animated(settlementStart, beamInfo3D, plot3dAnno):
-    # Calculate the maximum number of traces required for any frame
-    max_traces_per_frame = len(beamInfo3D['startX']) + 1  # +1 for the label trace
-
-    # Initialize the figure with the maximum number of empty traces
-    fig = go.Figure(data=[go.Scatter3d(x=[], y=[], z=[], mode='lines', showlegend=False) for _ in range(max_traces_per_frame)])
+@st.cache_resource(show_spinner=False, max_entries=10)
+def plot_3D_settlement_slider_animated(beam3D, plot3dAnno):
+    # Initialize the figure once with the styled traces for the first survey, frames then only swap the z values and colors
+    # Every beam is one segment of a single line trace
+    base_traces = [go.Scatter3d(
+        x=beam3D.lineX,
+        y=beam3D.lineY,
+        z = beam3D.lineZ[0],
+        name="",
+        mode='lines',
+        line = dict(
+            color = beam3D.lineColor[0],
+            width = 3,
+            dash = 'solid'),
+        hovertemplate="<br>".join([
+            "Settlement [ft]: %{z}"
+            ]),
+        hoverlabel=dict(
+            bgcolor = "white"
+            ),
+        showlegend=False 
+    )]
 
-    # Creating frames
+    # Plot the Marker Point (MP) labels in grey
+    base_traces.append(go.Scatter3d(
+        x=beam3D.labelX, 
+        y=beam3D.labelY, 
+        z=beam3D.startZ[0], 
+        text=beam3D.MP_W_S, 
+        mode='text', 
+        textfont=dict(
+            size=12,
+            color='grey'), 
+        hoverinfo='skip', 
+        showlegend=False
+    ))
+    # Creating frames as plain dicts holding only the updated values
     frames = []
-    for col in settlementStart.columns:
-        frame_traces = []  # List to hold all traces for this frame
-
-        # Create a separate trace for each line segment
-        for (startX, endX, startY, endY, startZ, endZ, startColor, endColor) in zip(beamInfo3D['startX'], beamInfo3D['endX'], 
-                                                                                    beamInfo3D['startY'], beamInfo3D['endY'], 
-                                                                                    beamInfo3D['{0}_start'.format(col)], 
-                                                                                    beamInfo3D['{0}_end'.format(col)],
-                                                                                    beamInfo3D[col],beamInfo3D[col]):
-
-            line_trace = go.Scatter3d(
-                x=[startX, endX],
-                y=[startY, endY],
-                z = [startZ, endZ],
-                text = beamInfo3D['MP_W_S'],
-                line_color= [startColor, endColor],
-                name="",
-                mode='lines',
+    for i, col in enumerate(beam3D.dates):
+        # Only the settlement and slope color of the beam lines and the label heights change between survey dates
+        frame_traces = [dict(
+                type = 'scatter3d',
+                z = beam3D.lineZ[i],
                 line = dict(
-                    color = 'black',
-                    width = 3,
-                    dash = 'solid'),
-                #hoverinfo='skip',
-                showlegend=False 
-            )
-            frame_traces.append(line_trace)
-
-        # Create the label trace for this frame
-        label_trace = go.Scatter3d(
-            x=beamInfo3D['labelX'], 
-            y=beamInfo3D['labelY'], 
-            z=beamInfo3D[f'{col}_start'], 
-            text=beamInfo3D['MP_W_S'], 
-            mode='text', 
-            textfont=dict(
-                size=12,
-                color='grey'), 
-            hoverinfo='skip', 
-            showlegend=False
-        )
-        frame_traces.append(label_trace)
-
-        # Ensure the frame has the same number of traces as the figure
-        while len(frame_traces) < max_traces_per_frame:
-            frame_traces.append(go.Scatter3d(x=[], y=[], z=[], mode=[]))
+                    color = beam3D.lineColor[i])
+            ),
+            dict(
+                type = 'scatter3d',
+                z = beam3D.startZ[i]
+            )]
 
-        # Add the frame
-        frames.append(go.Frame(data=frame_traces, name=col))
+        # Add the frame, mapping its data onto the line and label traces
+        frames.append(dict(data=frame_traces, traces=[0, 1], name=col))
 
-    fig.frames = frames
+    fig = go.Figure(data=base_traces, frames=frames)
 
     # Slider
     sliders = [{"steps": [{"args": [[f.name], {"frame": {"duration": 0, "redraw": True}, "mode": "immediate"}],
-                            "label": col, "method": "animate"} for col, f in zip(settlementStart.columns, fig.frames)],
+                            "label": col, "method": "animate"} for col, f in zip(beam3D.dates, fig.frames)],
                 "len": 0.95,
                 "x": 0.035,
                 "y": 0}]
@@ -1731,7 +1764,7 @@ def plot_3D_settlement_slider_animated(settlementStart, beamInfo3D, plot3dAnno):
         args=[[None], {"frame": {"duration": 0, "redraw": False}, "mode": "immediate", "transition": {"duration": 0}}]
     )
 
-    maxSettlement = settlementStart[settlementStart.columns[len(settlementStart.columns)-1]].max()
+    maxSettlement = beam3D.maxSettlement
 
     # Update layout for slider and set consistent y-axis range
     fig.update_layout(
@@ -1762,18 +1795,7 @@ def plot_3D_settlement_slider_animated(settlementStart, beamInfo3D, plot3dAnno):
         height = 600,
         scene_aspectmode='manual',
         scene_aspectratio=dict(x=7, y=2, z=1),
-        uniformtext_minsize=10,
         annotations = plot3dAnno
         )
 
-    # Set initial view, update hover mode
-    fig.update_traces(x=frames[0].data[0].x, 
-                    y=frames[0].data[0].y, 
-                    z=frames[0].data[0].z,
-                    hovertemplate="<br>".join([
-                        "Settlement [ft]: %{z}"
-                        ]),
-                    hoverlabel=dict(
-                        bgcolor = "white"
-                        ))
-    return fig
\ No newline at end of file
+    return fig